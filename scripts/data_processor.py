@@ -12,9 +12,14 @@ from typing import Dict, List, Optional, Any
 from dataclasses import dataclass
 import asyncio
 import aiohttp
-import pandas as pd
 import numpy as np
 
+# Optional fast JSON via orjson
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -32,88 +37,172 @@ class MessageData:
     error_message: Optional[str] = None
 
 class DataProcessor:
-    """Main data processor class"""
-    
+    """Main data processor class
+
+    Messages are stored column-wise (structure-of-arrays): numeric fields
+    live in typed NumPy arrays that grow by doubling, while string fields
+    stay in parallel Python lists. Analytics then reduce over contiguous
+    buffers instead of walking a list of dataclass instances.
+    """
+
+    _INITIAL_CAPACITY = 256
+    _ARRAY_COLUMNS = ('_timestamps', '_response_times', '_success', '_type_codes')
+
     def __init__(self):
-        self.messages: List[MessageData] = []
         self.analytics_data = {}
         self.start_time = datetime.now()
-    
+
+        self._count = 0
+        self._capacity = self._INITIAL_CAPACITY
+        self._timestamps = np.empty(self._capacity, dtype='datetime64[us]')
+        self._response_times = np.empty(self._capacity, dtype=np.float32)
+        self._success = np.empty(self._capacity, dtype=bool)
+        self._type_codes = np.empty(self._capacity, dtype=np.int8)
+
+        # Message-type labels interned to small integer codes
+        self._type_labels: List[str] = []
+        self._type_to_code: Dict[str, int] = {}
+
+        # Non-numeric per-message fields, kept only for export
+        self._ids: List[str] = []
+        self._user_ids: List[str] = []
+        self._content_lengths: List[int] = []
+        self._error_messages: List[Optional[str]] = []
+
+    @property
+    def message_count(self) -> int:
+        """Number of messages currently stored"""
+        return self._count
+
+    def _grow(self) -> None:
+        """Double the capacity of the numeric columns"""
+        self._capacity *= 2
+        for name in self._ARRAY_COLUMNS:
+            old = getattr(self, name)
+            grown = np.empty(self._capacity, dtype=old.dtype)
+            grown[:self._count] = old[:self._count]
+            setattr(self, name, grown)
+
     def add_message(self, message: MessageData) -> None:
         """Add a new message to the processor"""
-        self.messages.append(message)
-        logger.info(f"Added message {message.id} of type {message.message_type}")
-    
+        if self._count == self._capacity:
+            self._grow()
+
+        code = self._type_to_code.get(message.message_type)
+        if code is None:
+            code = len(self._type_labels)
+            self._type_to_code[message.message_type] = code
+            self._type_labels.append(message.message_type)
+
+        i = self._count
+        self._timestamps[i] = np.datetime64(message.timestamp, 'us')
+        self._response_times[i] = np.nan if message.response_time is None else message.response_time
+        self._success[i] = message.success
+        self._type_codes[i] = code
+        self._ids.append(message.id)
+        self._user_ids.append(message.user_id)
+        self._content_lengths.append(len(message.content))
+        self._error_messages.append(message.error_message)
+        self._count += 1
+
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Added message %s of type %s", message.id, message.message_type)
+
     def get_analytics(self) -> Dict[str, Any]:
         """Generate analytics data from messages"""
-        if not self.messages:
+        n = self._count
+        if n == 0:
             return {"error": "No messages to analyze"}
-        
-        # Convert to DataFrame for easier analysis
-        df = pd.DataFrame([
-            {
-                'timestamp': msg.timestamp,
-                'message_type': msg.message_type,
-                'response_time': msg.response_time,
-                'success': msg.success
-            }
-            for msg in self.messages
-        ])
-        
-        # Calculate metrics
-        total_messages = len(df)
-        success_rate = df['success'].mean() * 100
-        avg_response_time = df['response_time'].dropna().mean()
-        
-        # Message type distribution
-        type_distribution = df['message_type'].value_counts().to_dict()
-        
-        # Time-based analysis
-        df['hour'] = df['timestamp'].dt.hour
-        hourly_distribution = df.groupby('hour').size().to_dict()
-        
+
+        # Zero-copy views over the filled portion of each column
+        response_times = self._response_times[:n]
+        success = self._success[:n]
+
+        total_messages = n
+        success_rate = success.mean() * 100
+        valid_rt = response_times[~np.isnan(response_times)]
+        avg_response_time = float(valid_rt.mean()) if valid_rt.size else None
+
+        # Message type distribution from the interned codes
+        type_counts = np.bincount(self._type_codes[:n], minlength=len(self._type_labels))
+        type_distribution = {
+            label: int(count)
+            for label, count in zip(self._type_labels, type_counts)
+            if count > 0
+        }
+
+        # Time-based analysis: bucket by hour of day without a groupby
+        hours = self._timestamps[:n].astype('datetime64[h]').astype(np.int64) % 24
+        hourly_counts = np.bincount(hours, minlength=24)
+        hourly_distribution = {
+            int(hour): int(count)
+            for hour, count in enumerate(hourly_counts)
+            if count > 0
+        }
+
         return {
             "total_messages": total_messages,
-            "success_rate": round(success_rate, 2),
-            "average_response_time": round(avg_response_time, 2) if not pd.isna(avg_response_time) else 0,
+            "success_rate": round(float(success_rate), 2),
+            "average_response_time": round(avg_response_time, 2) if avg_response_time is not None else 0,
             "message_type_distribution": type_distribution,
             "hourly_distribution": hourly_distribution,
             "uptime_hours": (datetime.now() - self.start_time).total_seconds() / 3600
         }
-    
+
     def export_data(self, filename: str) -> None:
         """Export processed data to JSON file"""
         analytics = self.get_analytics()
+        n = self._count
+        response_times = self._response_times[:n]
         analytics['messages'] = [
             {
-                'id': msg.id,
-                'timestamp': msg.timestamp.isoformat(),
-                'user_id': msg.user_id,
-                'message_type': msg.message_type,
-                'content_length': len(msg.content),
-                'response_time': msg.response_time,
-                'success': msg.success,
-                'error_message': msg.error_message
+                'id': self._ids[i],
+                'timestamp': self._timestamps[i].item().isoformat(),
+                'user_id': self._user_ids[i],
+                'message_type': self._type_labels[self._type_codes[i]],
+                'content_length': self._content_lengths[i],
+                'response_time': None if np.isnan(response_times[i]) else float(response_times[i]),
+                'success': bool(self._success[i]),
+                'error_message': self._error_messages[i]
             }
-            for msg in self.messages
+            for i in range(n)
         ]
-        
-        with open(filename, 'w') as f:
-            json.dump(analytics, f, indent=2)
-        
+
+        if orjson is not None:
+            # orjson serializes dict/list-heavy payloads several times
+            # faster than stdlib json, indentation included; OPT_NON_STR_KEYS
+            # coerces the int hour keys to strings like stdlib json does
+            with open(filename, 'wb') as f:
+                f.write(orjson.dumps(
+                    analytics,
+                    option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY
+                    | orjson.OPT_NON_STR_KEYS))
+        else:
+            with open(filename, 'w') as f:
+                json.dump(analytics, f, indent=2)
+
         logger.info(f"Data exported to {filename}")
-    
+
     def cleanup_old_data(self, days: int = 7) -> None:
         """Remove messages older than specified days"""
-        cutoff_date = datetime.now() - timedelta(days=days)
-        original_count = len(self.messages)
-        
-        self.messages = [
-            msg for msg in self.messages 
-            if msg.timestamp > cutoff_date
-        ]
-        
-        removed_count = original_count - len(self.messages)
+        cutoff = np.datetime64(datetime.now() - timedelta(days=days), 'us')
+        n = self._count
+
+        # Timestamps are appended in arrival order, so the column is sorted
+        # and the cutoff reduces to a binary search plus a slice
+        removed_count = int(np.searchsorted(self._timestamps[:n], cutoff, side='right'))
+
+        if removed_count:
+            kept_count = n - removed_count
+            for name in self._ARRAY_COLUMNS:
+                column = getattr(self, name)
+                column[:kept_count] = column[removed_count:n]
+            self._ids = self._ids[removed_count:]
+            self._user_ids = self._user_ids[removed_count:]
+            self._content_lengths = self._content_lengths[removed_count:]
+            self._error_messages = self._error_messages[removed_count:]
+            self._count = kept_count
+
         logger.info(f"Cleaned up {removed_count} old messages")
 
 class APIClient:
@@ -124,71 +213,127 @@ class APIClient:
         self.session: Optional[aiohttp.ClientSession] = None
     
     async def __aenter__(self):
-        self.session = aiohttp.ClientSession()
+        # Pooled keep-alive connections so repeated polls reuse sockets
+        self.session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=32, ttl_dns_cache=300, keepalive_timeout=60),
+            timeout=aiohttp.ClientTimeout(total=5)
+        )
         return self
-    
+
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         if self.session:
             await self.session.close()
-    
-    async def get_health(self) -> Dict[str, Any]:
-        """Get health status from the API"""
+
+    async def _get_json(self, path: str) -> Dict[str, Any]:
+        """GET an endpoint and decode the JSON body"""
         if not self.session:
             raise RuntimeError("Session not initialized")
-        
-        async with self.session.get(f"{self.base_url}/health") as response:
-            return await response.json()
-    
+
+        async with self.session.get(f"{self.base_url}{path}") as response:
+            body = await response.read()
+        return orjson.loads(body) if orjson is not None else json.loads(body)
+
+    async def get_health(self) -> Dict[str, Any]:
+        """Get health status from the API"""
+        return await self._get_json("/health")
+
     async def get_metrics(self) -> Dict[str, Any]:
         """Get metrics from the API"""
-        if not self.session:
-            raise RuntimeError("Session not initialized")
-        
-        async with self.session.get(f"{self.base_url}/metrics") as response:
-            return await response.json()
+        return await self._get_json("/metrics")
+
+    async def get_all(self) -> List[Dict[str, Any]]:
+        """Fetch health and metrics concurrently over the pooled session"""
+        return await asyncio.gather(self.get_health(), self.get_metrics())
 
 class PerformanceMonitor:
-    """Monitor system performance"""
-    
+    """Monitor system performance
+
+    Metrics are stored column-wise like DataProcessor messages: values in a
+    NumPy array alongside interned metric-name codes, so the summary is a
+    handful of segment reductions instead of a Python grouping pass.
+    """
+
+    _INITIAL_CAPACITY = 256
+
     def __init__(self):
-        self.metrics_history: List[Dict[str, Any]] = []
         self.start_time = time.time()
-    
+
+        self._count = 0
+        self._capacity = self._INITIAL_CAPACITY
+        self._name_codes = np.empty(self._capacity, dtype=np.int32)
+        self._values = np.empty(self._capacity, dtype=np.float64)
+
+        self._names: List[str] = []
+        self._name_to_code: Dict[str, int] = {}
+        self._timestamps_ns = np.empty(self._capacity, dtype=np.int64)
+        self._tags: List[Dict[str, str]] = []
+
+    def _grow(self) -> None:
+        """Double the capacity of the metric columns"""
+        self._capacity *= 2
+        for name in ('_name_codes', '_values', '_timestamps_ns'):
+            old = getattr(self, name)
+            grown = np.empty(self._capacity, dtype=old.dtype)
+            grown[:self._count] = old[:self._count]
+            setattr(self, name, grown)
+
     def record_metric(self, metric_name: str, value: float, tags: Dict[str, str] = None) -> None:
         """Record a performance metric"""
-        metric = {
-            'timestamp': datetime.now().isoformat(),
-            'metric_name': metric_name,
-            'value': value,
-            'tags': tags or {}
-        }
-        self.metrics_history.append(metric)
-        logger.debug(f"Recorded metric {metric_name}: {value}")
-    
+        if self._count == self._capacity:
+            self._grow()
+
+        code = self._name_to_code.get(metric_name)
+        if code is None:
+            code = len(self._names)
+            self._name_to_code[metric_name] = code
+            self._names.append(metric_name)
+
+        i = self._count
+        self._name_codes[i] = code
+        self._values[i] = value
+        # Raw nanoseconds on the hot path; datetime conversion is deferred
+        # to metric_timestamps() for whoever actually needs it
+        self._timestamps_ns[i] = time.time_ns()
+        self._tags.append(tags or {})
+        self._count += 1
+
+        logger.debug("Recorded metric %s: %s", metric_name, value)
+
+    def metric_timestamps(self) -> np.ndarray:
+        """Recorded timestamps, converted lazily to datetime64[ns]"""
+        return self._timestamps_ns[:self._count].astype('datetime64[ns]')
+
     def get_performance_summary(self) -> Dict[str, Any]:
         """Get performance summary"""
-        if not self.metrics_history:
+        n = self._count
+        if n == 0:
             return {"error": "No metrics recorded"}
-        
-        # Group by metric name
-        metric_groups = {}
-        for metric in self.metrics_history:
-            name = metric['metric_name']
-            if name not in metric_groups:
-                metric_groups[name] = []
-            metric_groups[name].append(metric['value'])
-        
-        # Calculate statistics
+
+        # Stable sort by name code keeps chronological order within a metric,
+        # so the last element of each segment is its latest value
+        codes = self._name_codes[:n]
+        values = self._values[:n]
+        order = np.argsort(codes, kind='stable')
+        sorted_values = values[order]
+
+        starts = np.searchsorted(codes[order], np.arange(len(self._names)))
+        ends = np.append(starts[1:], n)
+
+        sums = np.add.reduceat(sorted_values, starts)
+        mins = np.minimum.reduceat(sorted_values, starts)
+        maxs = np.maximum.reduceat(sorted_values, starts)
+
         summary = {}
-        for name, values in metric_groups.items():
+        for code, name in enumerate(self._names):
+            count = int(ends[code] - starts[code])
             summary[name] = {
-                'count': len(values),
-                'min': min(values),
-                'max': max(values),
-                'avg': sum(values) / len(values),
-                'latest': values[-1]
+                'count': count,
+                'min': float(mins[code]),
+                'max': float(maxs[code]),
+                'avg': float(sums[code]) / count,
+                'latest': float(sorted_values[ends[code] - 1])
             }
-        
+
         return summary
 
 def main():
@@ -8,9 +8,33 @@ import sys
 import os
 import json
 import asyncio
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from data_processor import DataProcessor, MessageData, APIClient, PerformanceMonitor
 
+AUDIO_EXTENSIONS = ('.wav', '.mp3', '.flac', '.ogg', '.m4a')
+
+def _process_audio_file(input_path: str) -> dict:
+    """Run the full audio pipeline on one file (executed in a worker process)"""
+    from audio_processor import AudioProcessor
+    output_path = os.path.splitext(input_path)[0] + '_processed.wav'
+    return AudioProcessor().process_audio_file(input_path, output_path)
+
+def process_audio_directory(audio_dir: str) -> list:
+    """Process every audio file in a directory across all CPU cores"""
+    paths = sorted(
+        os.path.join(audio_dir, name)
+        for name in os.listdir(audio_dir)
+        if name.lower().endswith(AUDIO_EXTENSIONS)
+    )
+    if not paths:
+        return []
+
+    # One file per task, fanned out across processes: decoding and the
+    # FFT-heavy feature extraction parallelize cleanly per file
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        return list(executor.map(_process_audio_file, paths, chunksize=4))
+
 async def main():
     """Main analytics function"""
     print("🔍 WebSocket AI Assistant Analytics")
@@ -66,6 +90,13 @@ async def main():
     processor.export_data("analytics_export.json")
     print("✅ Data exported to analytics_export.json")
     
+    # Process audio samples in parallel (directory is optional)
+    audio_dir = sys.argv[1] if len(sys.argv) > 1 else "audio_samples"
+    if os.path.isdir(audio_dir):
+        print(f"\n🎵 Processing audio files in {audio_dir}...")
+        results = process_audio_directory(audio_dir)
+        print(f"✅ Processed {len(results)} audio files")
+
     # Try to connect to API (if running)
     print("\n🔌 Checking API connection...")
     try:
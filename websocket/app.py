@@ -1,270 +1,456 @@
-from flask import Flask, send_from_directory
-from flask_sock import Sock
-import json
-import time
-import threading
-import traceback
-import logging
-from werkzeug.serving import WSGIRequestHandler
-
-# Disable excessive logging
-logging.getLogger('werkzeug').setLevel(logging.WARNING)
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
-logger = logging.getLogger(__name__)
-
-app = Flask(__name__)
-sock = Sock(app)
-
-# Store active connections with metadata
-active_connections = {}
-
-class ConnectionManager:
-    def __init__(self):
-        self.connections = {}
-        self.message_count = 0
-    
-    def add_connection(self, ws, connection_id):
-        self.connections[connection_id] = {
-            'ws': ws,
-            'connected_at': time.time(),
-            'last_ping': time.time(),
-            'message_count': 0
-        }
-        logger.info(f"➕ Connection {connection_id} added. Total: {len(self.connections)}")
-    
-    def remove_connection(self, connection_id):
-        if connection_id in self.connections:
-            conn_info = self.connections[connection_id]
-            duration = time.time() - conn_info['connected_at']
-            del self.connections[connection_id]
-            logger.info(f"➖ Connection {connection_id} removed (lived {duration:.1f}s). Total: {len(self.connections)}")
-    
-    def get_connection_info(self):
-        return {
-            'total_connections': len(self.connections),
-            'connections': {
-                cid: {
-                    'connected_at': info['connected_at'],
-                    'duration': time.time() - info['connected_at'],
-                    'message_count': info['message_count']
-                } for cid, info in self.connections.items()
-            }
-        }
-
-connection_manager = ConnectionManager()
-
-@app.route("/")
-def index():
-    return send_from_directory(".", "index.html")
-
-@app.route("/status")
-def status():
-    """Health check endpoint"""
-    return {
-        "status": "healthy",
-        "server_time": int(time.time()),
-        **connection_manager.get_connection_info()
-    }
-
-def safe_send(ws, message, connection_id):
-    """Safely send a message to WebSocket"""
-    try:
-        ws.send(json.dumps(message))
-        return True
-    except Exception as e:
-        logger.error(f"Failed to send message to {connection_id}: {e}")
-        return False
-
-@sock.route("/ws")
-def ws_handler(ws):
-    connection_id = f"conn_{int(time.time() * 1000)}_{id(ws) % 10000}"
-    logger.info(f"🔌 NEW CONNECTION: {connection_id}")
-    
-    try:
-        # Add to connection manager
-        connection_manager.add_connection(ws, connection_id)
-        
-        # Send immediate welcome message
-        welcome_msg = {
-            "type": "system_ready",
-            "message": "🤖 Test connection successful!",
-            "connection_id": connection_id,
-            "server_time": int(time.time())
-        }
-        
-        if not safe_send(ws, welcome_msg, connection_id):
-            logger.error(f"Failed to send welcome message to {connection_id}")
-            return
-        
-        logger.info(f"✅ Welcome sent to {connection_id}")
-        
-        # Main message loop - NO TIMEOUTS!
-        while True:
-            try:
-                # Blocking receive - let the client control the flow
-                raw_message = ws.receive()
-                
-                if raw_message is None:
-                    logger.info(f"📪 Connection {connection_id} closed by client (clean)")
-                    break
-                
-                # Update connection stats
-                if connection_id in connection_manager.connections:
-                    connection_manager.connections[connection_id]['message_count'] += 1
-                    connection_manager.connections[connection_id]['last_ping'] = time.time()
-                
-                # Parse and handle message
-                try:
-                    message = json.loads(raw_message)
-                    msg_type = message.get('type', 'unknown')
-                    
-                    logger.info(f"📨 {connection_id}: {msg_type}")
-                    
-                    # Handle different message types
-                    response = None
-                    
-                    if msg_type == "ping":
-                        response = {
-                            "type": "pong",
-                            "timestamp": int(time.time()),
-                            "original_timestamp": message.get('timestamp'),
-                            "server_connection_time": time.time() - connection_manager.connections[connection_id]['connected_at']
-                        }
-                        
-                    elif msg_type == "test":
-                        response = {
-                            "type": "test_response",
-                            "message": "✅ Test successful!",
-                            "echo_data": message.get('data', ''),
-                            "server_time": int(time.time()),
-                            "connection_stats": {
-                                "id": connection_id,
-                                "messages_received": connection_manager.connections[connection_id]['message_count'],
-                                "uptime": time.time() - connection_manager.connections[connection_id]['connected_at']
-                            }
-                        }
-                        
-                    elif msg_type == "heartbeat":
-                        response = {
-                            "type": "heartbeat_ack",
-                            "timestamp": int(time.time()),
-                            "connection_uptime": time.time() - connection_manager.connections[connection_id]['connected_at']
-                        }
-                        # Don't log every heartbeat to avoid spam
-                        logger.debug(f"💓 Heartbeat from {connection_id}")
-                        
-                    elif msg_type == "audio_stream":
-                        # Handle audio data (for your main app)
-                        audio_size = len(message.get('data', ''))
-                        response = {
-                            "type": "audio_received",
-                            "message": f"🎵 Audio chunk received ({audio_size} bytes)",
-                            "size": audio_size,
-                            "timestamp": int(time.time())
-                        }
-                        
-                    else:
-                        # Echo unknown messages
-                        response = {
-                            "type": "echo",
-                            "original_type": msg_type,
-                            "message": f"📡 Echo: {msg_type}",
-                            "original_message": message,
-                            "timestamp": int(time.time())
-                        }
-                    
-                    # Send response
-                    if response:
-                        if not safe_send(ws, response, connection_id):
-                            logger.error(f"Failed to send response to {connection_id}")
-                            break
-                        
-                        if msg_type == "ping":
-                            logger.debug(f"🏓 Pong sent to {connection_id}")
-                        elif msg_type == "heartbeat":
-                            # Don't spam logs with heartbeat responses
-                            pass
-                        else:
-                            logger.info(f"📤 Response sent to {connection_id}: {response['type']}")
-                            
-                except json.JSONDecodeError as e:
-                    logger.warning(f"❌ Invalid JSON from {connection_id}: {e}")
-                    error_response = {
-                        "type": "error",
-                        "message": "Invalid JSON format",
-                        "error": str(e),
-                        "timestamp": int(time.time())
-                    }
-                    if not safe_send(ws, error_response, connection_id):
-                        break
-                        
-                except Exception as e:
-                    logger.error(f"❌ Message processing error for {connection_id}: {e}")
-                    logger.debug(traceback.format_exc())
-                    
-                    error_response = {
-                        "type": "error", 
-                        "message": "Server processing error",
-                        "timestamp": int(time.time())
-                    }
-                    if not safe_send(ws, error_response, connection_id):
-                        break
-                    
-            except Exception as e:
-                error_str = str(e).lower()
-                if any(term in error_str for term in ['closed', 'broken', 'reset', 'aborted']):
-                    logger.info(f"📪 Connection {connection_id} closed unexpectedly: {e}")
-                else:
-                    logger.error(f"❌ Receive error for {connection_id}: {e}")
-                    logger.debug(traceback.format_exc())
-                break
-                    
-    except Exception as e:
-        logger.error(f"❌ WebSocket handler error for {connection_id}: {e}")
-        logger.debug(traceback.format_exc())
-        
-    finally:
-        # Always clean up
-        connection_manager.remove_connection(connection_id)
-        logger.info(f"🧹 Cleanup completed for {connection_id}")
-
-# Custom request handler to reduce logging noise
-class QuietWSGIRequestHandler(WSGIRequestHandler):
-    def log_request(self, code='-', size='-'):
-        # Only log non-WebSocket requests
-        if not self.path.startswith('/ws'):
-            super().log_request(code, size)
-
-if __name__ == "__main__":
-    print("=" * 60)
-    print("🚀 BULLETPROOF WebSocket Server Starting...")
-    print("=" * 60)
-    print("✨ Features:")
-    print("  🔒 Bulletproof error handling")
-    print("  📊 Connection management & stats")
-    print("  🏓 Ping/pong support")
-    print("  🧪 Test message support")
-    print("  🎵 Audio stream ready")
-    print("  📈 Status endpoint: http://localhost:5000/status")
-    print("=" * 60)
-    print("💡 No more mysterious disconnections!")
-    print("⏹️  Press Ctrl+C to stop")
-    print("=" * 60)
-    
-    try:
-        app.run(
-            host="0.0.0.0",
-            port=5000,
-            debug=False,
-            threaded=True,
-            use_reloader=False,
-            request_handler=QuietWSGIRequestHandler
-        )
-    except KeyboardInterrupt:
-        print("\n" + "=" * 60)
-        print("👋 Server stopped gracefully!")
-        print(f"📊 Final stats: {connection_manager.get_connection_info()}")
-        print("=" * 60)
-    except Exception as e:
-        logger.error(f"❌ Server startup failed: {e}")
-        logger.debug(traceback.format_exc())
\ No newline at end of file
+from flask import Flask, Response, send_from_directory
+from flask_sock import Sock
+import itertools
+import json
+import queue
+import time
+import threading
+import traceback
+import logging
+from array import array
+from dataclasses import dataclass
+from werkzeug.serving import WSGIRequestHandler
+
+# orjson is several times faster than stdlib json on the per-message
+# parse/serialize path; fall back to stdlib when it is not installed
+try:
+    import orjson
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps  # returns bytes, which flask_sock accepts
+except ImportError:
+    orjson = None
+    _json_loads = json.loads
+    _json_dumps = lambda obj: json.dumps(obj).encode()
+
+# Exception types that simply mean "the peer went away"; checked by type
+# instead of scanning the exception text on every disconnect
+try:
+    from simple_websocket import ConnectionClosed
+    _CLOSED_EXC = (ConnectionClosed, ConnectionResetError, BrokenPipeError)
+except ImportError:
+    ConnectionClosed = None
+    _CLOSED_EXC = (ConnectionResetError, BrokenPipeError)
+
+# Send failures that just mean the peer is gone; anything else is a real
+# bug and propagates instead of being logged away
+_SEND_FAIL = _CLOSED_EXC + (OSError,)
+
+# Disable excessive logging
+logging.getLogger('werkzeug').setLevel(logging.WARNING)
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+app = Flask(__name__)
+sock = Sock(app)
+
+from handlers import handle_message
+
+# Pre-serialized responses for the fixed-shape message types: the only
+# dynamic fields are interpolated with bytes.replace, so repeat sends skip
+# dict construction and the JSON encoder entirely
+_WELCOME_TMPL = (b'{"type":"system_ready",'
+                 b'"message":"\xf0\x9f\xa4\x96 Test connection successful!",'
+                 b'"connection_id":"__CID__","server_time":__TS__}')
+_HEARTBEAT_ACK_TMPL = (b'{"type":"heartbeat_ack",'
+                       b'"timestamp":__TS__,"connection_uptime":__UP__}')
+_AUDIO_ACK_TMPL = (b'{"type":"audio_received",'
+                   b'"message":"\xf0\x9f\x8e\xb5 Audio chunk received (__SIZE__ bytes)",'
+                   b'"size":__SIZE__,"timestamp":__TS__}')
+
+# Audio sent as binary WebSocket frames never touches the JSON parser: the
+# raw buffer is queued here and drained by a background worker thread. The
+# queue is bounded so clients streaming faster than the worker drains
+# cannot grow the intake without limit; overflowing frames are dropped
+_AUDIO_QUEUE_MAX = 256
+_audio_queue = queue.Queue(maxsize=_AUDIO_QUEUE_MAX)
+
+def _audio_worker():
+    """Drain queued audio buffers off the receive path"""
+    while True:
+        chunk = _audio_queue.get()
+        # Processing hook for the main app; for now just account for the bytes
+        logger.debug("Processed audio chunk of %d bytes", len(chunk))
+
+threading.Thread(target=_audio_worker, daemon=True, name="audio-worker").start()
+
+# Cap on queued outbound payloads per connection: a client that sends but
+# never reads hits this instead of growing the queue without bound, and the
+# overflow is treated like any other failed send
+_SEND_QUEUE_MAX = 128
+
+@dataclass(slots=True)
+class Connection:
+    """Per-connection handle for the hot loop: fixed slots, no dict lookups"""
+    ws: object
+    idx: int
+    id: str
+    out_q: object          # bounded queue.Queue of serialized outbound payloads
+    send_failed: bool = False
+
+def _sender(conn):
+    """Drain one connection's outbound queue onto its socket.
+
+    One writer per connection (a cheap greenlet under the gevent deployment)
+    means the receive loop only enqueues: it never blocks on a slow client's
+    socket, and rapid-fire ack bursts are written back-to-back instead of
+    interleaving a receive wakeup between every frame. A None payload is the
+    shutdown sentinel, queued behind any remaining messages on disconnect.
+    """
+    while True:
+        payload = conn.out_q.get()
+        if payload is None:
+            return
+        try:
+            conn.ws.send(payload)
+        except _SEND_FAIL:
+            # Peer gone; the receive loop notices via send_failed and logs
+            # with message context, so no formatting work happens here
+            conn.send_failed = True
+            return
+
+class ConnectionManager:
+    """Connection registry in structure-of-arrays layout.
+
+    Per-connection stats live in parallel typed arrays indexed by an integer
+    slot, so per-message updates are single indexed stores instead of nested
+    dict lookups — no string-keyed hashing anywhere on the message path. The
+    display ids in conn_ids exist only for logs and the /status payload.
+    Freed slots are recycled through a free list.
+
+    Slot allocation/release and the /status walk mutate or scan all the
+    columns together, so they serialize on a lock; touch() stays lock-free
+    because each live slot is written by its owning handler thread only.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.ws = []                    # slot -> websocket (None when free)
+        self.conn_ids = []              # slot -> display id for logs/status
+        self.connected_at = array('d')  # wall clock, for /status display only
+        self.connected_at_ns = array('q')  # monotonic, for duration math
+        self.last_ping_ns = array('q')
+        self.message_count = array('Q')
+        self._free_slots = []
+        self.active_count = 0
+
+        # Rolling /status snapshot: pre-serialized bytes, rebuilt lazily
+        self._snapshot_bytes = b''
+        self._snapshot_ts = 0.0
+
+    def add_connection(self, ws, connection_id):
+        now = time.time()
+        now_ns = time.monotonic_ns()
+        with self._lock:
+            if self._free_slots:
+                idx = self._free_slots.pop()
+                self.ws[idx] = ws
+                self.conn_ids[idx] = connection_id
+                self.connected_at[idx] = now
+                self.connected_at_ns[idx] = now_ns
+                self.last_ping_ns[idx] = now_ns
+                self.message_count[idx] = 0
+            else:
+                idx = len(self.ws)
+                self.ws.append(ws)
+                self.conn_ids.append(connection_id)
+                self.connected_at.append(now)
+                self.connected_at_ns.append(now_ns)
+                self.last_ping_ns.append(now_ns)
+                self.message_count.append(0)
+            self.active_count += 1
+        logger.info("➕ Connection %s added. Total: %d", connection_id, self.active_count)
+        return idx
+
+    def remove_connection(self, conn_idx):
+        with self._lock:
+            if not (0 <= conn_idx < len(self.ws) and self.ws[conn_idx] is not None):
+                return
+            connection_id = self.conn_ids[conn_idx]
+            duration = (time.monotonic_ns() - self.connected_at_ns[conn_idx]) / 1e9
+            self.ws[conn_idx] = None
+            self.conn_ids[conn_idx] = None
+            self._free_slots.append(conn_idx)
+            self.active_count -= 1
+        logger.info("➖ Connection %s removed (lived %.1fs). Total: %d", connection_id, duration, self.active_count)
+
+    def touch(self, conn_idx, now_ns):
+        """Record one received message in a single pass over the arrays.
+
+        Bumps the message count and refreshes last_ping — two adjacent
+        indexed stores — and returns (uptime, message_count) so the hot
+        loop does not re-read the arrays afterwards.
+        """
+        count = self.message_count[conn_idx] + 1
+        self.message_count[conn_idx] = count
+        self.last_ping_ns[conn_idx] = now_ns
+        return (now_ns - self.connected_at_ns[conn_idx]) / 1e9, count
+
+    def get_connection_info(self):
+        now_ns = time.monotonic_ns()
+        with self._lock:
+            return {
+                'total_connections': self.active_count,
+                'connections': {
+                    self.conn_ids[idx]: {
+                        'connected_at': self.connected_at[idx],
+                        'duration': (now_ns - self.connected_at_ns[idx]) / 1e9,
+                        'message_count': self.message_count[idx]
+                    } for idx in range(len(self.ws)) if self.ws[idx] is not None
+                }
+            }
+
+    def get_connection_info_bytes(self):
+        """Status payload as cached JSON bytes, rebuilt at most once per second"""
+        if time.monotonic() - self._snapshot_ts > 1.0:
+            self._snapshot_bytes = _json_dumps({
+                "status": "healthy",
+                "server_time": int(time.time()),
+                **self.get_connection_info()
+            })
+            self._snapshot_ts = time.monotonic()
+        return self._snapshot_bytes
+
+connection_manager = ConnectionManager()
+
+# Monotonic connection ids: unique by construction and cheaper than the old
+# timestamp+id(ws) formatting, which could also collide
+_conn_counter = itertools.count(1)
+
+@app.route("/")
+def index():
+    return send_from_directory(".", "index.html")
+
+@app.route("/status")
+def status():
+    """Health check endpoint (served from the cached snapshot)"""
+    return Response(connection_manager.get_connection_info_bytes(),
+                    mimetype='application/json')
+
+def safe_send(conn, message):
+    """Serialize and queue a message for the connection's sender"""
+    return safe_send_raw(conn, _json_dumps(message))
+
+def safe_send_raw(conn, payload):
+    """Queue an already-serialized payload for the connection's sender"""
+    if conn.send_failed:
+        return False
+    try:
+        conn.out_q.put_nowait(payload)
+    except queue.Full:
+        # The client is not reading its socket; drop it like a dead peer
+        logger.warning("Send queue full for %s, dropping connection", conn.id)
+        conn.send_failed = True
+        return False
+    return True
+
+@sock.route("/ws")
+def ws_handler(ws):
+    connection_id = f"conn_{next(_conn_counter)}"
+    logger.info("🔌 NEW CONNECTION: %s", connection_id)
+
+    conn = None
+    try:
+        # Add to connection manager and build the slotted per-connection handle
+        conn = Connection(ws, connection_manager.add_connection(ws, connection_id),
+                          connection_id, queue.Queue(maxsize=_SEND_QUEUE_MAX))
+        threading.Thread(target=_sender, args=(conn,), daemon=True,
+                         name=f"sender-{connection_id}").start()
+
+        # Send immediate welcome message from the precompiled template
+        welcome_payload = (_WELCOME_TMPL
+                           .replace(b"__CID__", connection_id.encode())
+                           .replace(b"__TS__", str(int(time.time())).encode()))
+
+        if not safe_send_raw(conn, welcome_payload):
+            logger.error("Failed to send welcome message to %s", connection_id)
+            return
+        
+        logger.debug("✅ Welcome sent to %s", connection_id)
+        
+        # Main message loop - NO TIMEOUTS!
+        while True:
+            try:
+                # Blocking receive - let the client control the flow
+                raw_message = ws.receive()
+                
+                if raw_message is None:
+                    logger.info("📪 Connection %s closed by client (clean)", connection_id)
+                    break
+                
+                # One monotonic read for all duration math plus one integer
+                # wall-clock read for the spec-visible timestamp fields
+                now_ns = time.monotonic_ns()
+                now_i = time.time_ns() // 1_000_000_000
+
+                # Update connection stats in one fused pass over the arrays
+                uptime, msg_count = connection_manager.touch(conn.idx, now_ns)
+
+                # Binary frames carry audio: hand the buffer to the worker
+                # and ack from a template without parsing anything
+                if isinstance(raw_message, (bytes, bytearray)):
+                    try:
+                        _audio_queue.put_nowait(raw_message)
+                    except queue.Full:
+                        # Worker is behind; drop the frame (audio is lossy)
+                        # and withhold the ack so the client can back off
+                        logger.warning("Audio queue full, dropping %d-byte frame from %s",
+                                       len(raw_message), connection_id)
+                        continue
+                    ack_payload = (_AUDIO_ACK_TMPL
+                                   .replace(b"__SIZE__", str(len(raw_message)).encode())
+                                   .replace(b"__TS__", str(now_i).encode()))
+                    if not safe_send_raw(conn, ack_payload):
+                        logger.error("Failed to send response to %s", connection_id)
+                        break
+                    continue
+
+                # Heartbeats are the hottest text frames and have a fixed
+                # prefix, so they are recognized and answered before any
+                # JSON parse touches the payload
+                if raw_message.startswith('{"type":"heartbeat"'):
+                    ack_payload = (_HEARTBEAT_ACK_TMPL
+                                   .replace(b"__TS__", str(now_i).encode())
+                                   .replace(b"__UP__", str(uptime).encode()))
+                    if not safe_send_raw(conn, ack_payload):
+                        logger.error("Failed to send response to %s", connection_id)
+                        break
+                    # Don't spam logs with heartbeat responses
+                    logger.debug("💓 Heartbeat from %s", connection_id)
+                    continue
+
+                # Parse and handle message
+                try:
+                    # orjson's JSONDecodeError subclasses json.JSONDecodeError,
+                    # so the except clause below covers both decoders
+                    message = _json_loads(raw_message)
+                    msg_type = message.get('type', 'unknown')
+                    
+                    logger.debug("📨 %s: %s", connection_id, msg_type)
+
+                    # Handle different message types; handlers return the
+                    # response already serialized from their byte templates
+                    response = handle_message(message, msg_type, uptime,
+                                              msg_count, connection_id, now_i)
+
+                    # Send response
+                    if response:
+                        if not safe_send_raw(conn, response):
+                            logger.error("Failed to send response to %s", connection_id)
+                            break
+
+                        if msg_type == "ping":
+                            logger.debug("🏓 Pong sent to %s", connection_id)
+                        else:
+                            logger.debug("📤 Response sent to %s: %s", connection_id, msg_type)
+                            
+                except json.JSONDecodeError as e:
+                    logger.warning("❌ Invalid JSON from %s: %s", connection_id, e)
+                    error_response = {
+                        "type": "error",
+                        "message": "Invalid JSON format",
+                        "error": str(e),
+                        "timestamp": int(time.time())
+                    }
+                    if not safe_send(conn, error_response):
+                        break
+                        
+                except Exception as e:
+                    logger.error("❌ Message processing error for %s: %s", connection_id, e)
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug(traceback.format_exc())
+                    
+                    error_response = {
+                        "type": "error", 
+                        "message": "Server processing error",
+                        "timestamp": int(time.time())
+                    }
+                    if not safe_send(conn, error_response):
+                        break
+                    
+            except Exception as e:
+                if isinstance(e, _CLOSED_EXC):
+                    logger.info("📪 Connection %s closed unexpectedly: %s", connection_id, e)
+                else:
+                    # String fallback only for odd driver-specific errors that
+                    # don't use the standard disconnect exception types
+                    error_str = str(e).lower()
+                    if any(term in error_str for term in ('closed', 'broken', 'reset', 'aborted')):
+                        logger.info("📪 Connection %s closed unexpectedly: %s", connection_id, e)
+                    else:
+                        logger.error("❌ Receive error for %s: %s", connection_id, e)
+                        if logger.isEnabledFor(logging.DEBUG):
+                            logger.debug(traceback.format_exc())
+                break
+                    
+    except Exception as e:
+        logger.error("❌ WebSocket handler error for %s: %s", connection_id, e)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(traceback.format_exc())
+        
+    finally:
+        # Always clean up: stop the sender after whatever is still queued.
+        # No other producer is left at this point, so if the bounded queue
+        # is full the backlog is discarded to make room for the sentinel.
+        if conn is not None:
+            conn.send_failed = True
+            try:
+                conn.out_q.put_nowait(None)
+            except queue.Full:
+                try:
+                    while True:
+                        conn.out_q.get_nowait()
+                except queue.Empty:
+                    pass
+                conn.out_q.put_nowait(None)
+            connection_manager.remove_connection(conn.idx)
+        logger.debug("🧹 Cleanup completed for %s", connection_id)
+
+# Custom request handler to reduce logging noise
+class QuietWSGIRequestHandler(WSGIRequestHandler):
+    def log_request(self, code='-', size='-'):
+        # Only log non-WebSocket requests
+        if not self.path.startswith('/ws'):
+            super().log_request(code, size)
+
+# Development runner only. In production deploy under gunicorn with gevent
+# workers, where each worker multiplexes thousands of greenlet-backed
+# connections on one thread instead of one kernel thread per WebSocket
+# (flask_sock detects gevent automatically):
+#
+#   gunicorn -k gevent -w 4 --worker-connections 1000 -b 0.0.0.0:5000 app:app
+#
+if __name__ == "__main__":
+    print("=" * 60)
+    print("🚀 BULLETPROOF WebSocket Server Starting (dev mode)...")
+    print("=" * 60)
+    print("✨ Features:")
+    print("  🔒 Bulletproof error handling")
+    print("  📊 Connection management & stats")
+    print("  🏓 Ping/pong support")
+    print("  🧪 Test message support")
+    print("  🎵 Audio stream ready")
+    print("  📈 Status endpoint: http://localhost:5000/status")
+    print("=" * 60)
+    print("💡 No more mysterious disconnections!")
+    print("🏭 Production: gunicorn -k gevent -w 4 --worker-connections 1000 app:app")
+    print("⏹️  Press Ctrl+C to stop")
+    print("=" * 60)
+    
+    try:
+        app.run(
+            host="0.0.0.0",
+            port=5000,
+            debug=False,
+            threaded=True,
+            use_reloader=False,
+            request_handler=QuietWSGIRequestHandler
+        )
+    except KeyboardInterrupt:
+        print("\n" + "=" * 60)
+        print("👋 Server stopped gracefully!")
+        print(f"📊 Final stats: {connection_manager.get_connection_info()}")
+        print("=" * 60)
+    except Exception as e:
+        logger.error("❌ Server startup failed: %s", e)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(traceback.format_exc())
\ No newline at end of file
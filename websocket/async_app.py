@@ -0,0 +1,106 @@
+"""Asyncio variant of the WebSocket test server.
+
+Speaks the same message protocol as app.py but drives every connection from
+a single-threaded event loop instead of one OS thread per WebSocket, so
+concurrent-connection capacity is bounded by sockets rather than thread
+stacks. Installs uvloop when available for a faster loop implementation;
+the Flask app in app.py remains the default entry point and keeps serving
+the index page and /status endpoint.
+
+The protocol itself lives in handlers.py — the same socket-free module
+app.py dispatches through — so the two servers cannot drift apart; this
+file only supplies the asyncio transport around it.
+
+Run with: python async_app.py  (requires: pip install websockets uvloop)
+"""
+
+import asyncio
+import json
+import logging
+import time
+
+import websockets
+
+from handlers import handle_message
+
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps
+except ImportError:
+    orjson = None
+    _json_loads = json.loads
+    _json_dumps = lambda obj: json.dumps(obj).encode()
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# connection_id -> {'connected_at': float, 'message_count': int}
+connections = {}
+_next_conn_id = 0
+
+
+async def ws_handler(ws):
+    global _next_conn_id
+    _next_conn_id += 1
+    connection_id = f"conn_{_next_conn_id}"
+    connections[connection_id] = {'connected_at': time.time(), 'message_count': 0}
+    logger.info("🔌 NEW CONNECTION: %s", connection_id)
+
+    conn_info = connections[connection_id]
+
+    try:
+        await ws.send(_json_dumps({
+            "type": "system_ready",
+            "message": "🤖 Test connection successful!",
+            "connection_id": connection_id,
+            "server_time": int(time.time())
+        }))
+
+        async for raw_message in ws:
+            now = time.time()
+            conn_info['message_count'] += 1
+
+            try:
+                message = _json_loads(raw_message)
+            except json.JSONDecodeError as e:
+                await ws.send(_json_dumps({
+                    "type": "error",
+                    "message": "Invalid JSON format",
+                    "error": str(e),
+                    "timestamp": int(now)
+                }))
+                continue
+
+            msg_type = message.get('type', 'unknown')
+            uptime = now - conn_info['connected_at']
+
+            # Shared dispatch with app.py: handlers return the response
+            # already serialized, ready for the socket
+            await ws.send(handle_message(message, msg_type, uptime,
+                                         conn_info['message_count'],
+                                         connection_id, int(now)))
+
+    except websockets.ConnectionClosed:
+        logger.info("📪 Connection %s closed", connection_id)
+    finally:
+        del connections[connection_id]
+        logger.info("🧹 Cleanup completed for %s", connection_id)
+
+
+async def main():
+    async with websockets.serve(ws_handler, "0.0.0.0", 5001):
+        logger.info("🚀 Async WebSocket server listening on ws://0.0.0.0:5001")
+        await asyncio.Future()
+
+
+if __name__ == "__main__":
+    if uvloop is not None:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+        logger.info("Using uvloop event loop")
+    asyncio.run(main())
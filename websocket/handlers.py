@@ -0,0 +1,120 @@
+"""Per-message handlers for the WebSocket test server.
+
+This module holds the interpreter-bound part of the hot loop: building the
+serialized response for each parsed message. It deliberately has no Flask
+or socket imports and carries full type annotations so it can be compiled
+to a C extension with mypyc (`mypyc websocket/handlers.py`) or run
+unchanged under PyPy; app.py picks up the compiled module transparently.
+
+Responses with a fixed shape live here as pre-encoded UTF-8 byte
+templates. The multi-byte emoji are stored as raw UTF-8 bytes, so neither
+encoder ever touches them again; the dynamic fields are all ASCII ints,
+floats and short ids spliced in with bytes.replace. Arbitrary client
+values (echoed data, original timestamps) are escaped through the JSON
+encoder and spliced in as already-valid JSON fragments.
+"""
+
+import json
+from typing import Any, Callable, Dict
+
+try:
+    import orjson
+    _dumps = orjson.dumps
+except ImportError:
+    orjson = None
+    _dumps = lambda obj: json.dumps(obj).encode()
+
+# Pre-serialized response shapes: constant keys, constant emoji bytes
+# (\xe2\x9c\x85 = check mark, \xf0\x9f\x8e\xb5 = musical note), placeholders
+# for the per-message fields
+_PONG_TMPL = (b'{"type":"pong","timestamp":__TS__,'
+              b'"original_timestamp":__OTS__,'
+              b'"server_connection_time":__UP__}')
+_TEST_TMPL = (b'{"type":"test_response",'
+              b'"message":"\xe2\x9c\x85 Test successful!",'
+              b'"echo_data":__DATA__,"server_time":__TS__,'
+              b'"connection_stats":{"id":"__CID__",'
+              b'"messages_received":__MC__,"uptime":__UP__}}')
+_HEARTBEAT_ACK_TMPL = (b'{"type":"heartbeat_ack",'
+                       b'"timestamp":__TS__,"connection_uptime":__UP__}')
+_AUDIO_RECEIVED_TMPL = (b'{"type":"audio_received",'
+                        b'"message":"\xf0\x9f\x8e\xb5 Audio chunk received '
+                        b'(__SIZE__ bytes)","size":__SIZE__,'
+                        b'"timestamp":__TS__}')
+
+# All handlers share one signature so dispatch is a single dict lookup;
+# connection stats arrive as plain scalars read once from the manager arrays
+# (uptime is precomputed from the monotonic clock by the caller)
+Handler = Callable[[Dict[str, Any], str, float, int, str, int], bytes]
+
+
+def _handle_ping(message: Dict[str, Any], msg_type: str,
+                 uptime: float, message_count: int, connection_id: str,
+                 now_i: int) -> bytes:
+    # Client-controlled fragments go in last, so a payload that happens to
+    # contain a placeholder token is never rewritten by a later replace
+    return (_PONG_TMPL
+            .replace(b"__TS__", str(now_i).encode())
+            .replace(b"__UP__", str(uptime).encode())
+            .replace(b"__OTS__", _dumps(message.get('timestamp'))))
+
+
+def _handle_test(message: Dict[str, Any], msg_type: str,
+                 uptime: float, message_count: int, connection_id: str,
+                 now_i: int) -> bytes:
+    # Client-controlled echo_data is spliced last (see _handle_ping)
+    return (_TEST_TMPL
+            .replace(b"__TS__", str(now_i).encode())
+            .replace(b"__CID__", connection_id.encode())
+            .replace(b"__MC__", str(message_count).encode())
+            .replace(b"__UP__", str(uptime).encode())
+            .replace(b"__DATA__", _dumps(message.get('data', ''))))
+
+
+def _handle_heartbeat(message: Dict[str, Any], msg_type: str,
+                      uptime: float, message_count: int, connection_id: str,
+                      now_i: int) -> bytes:
+    return (_HEARTBEAT_ACK_TMPL
+            .replace(b"__TS__", str(now_i).encode())
+            .replace(b"__UP__", str(uptime).encode()))
+
+
+def _handle_audio(message: Dict[str, Any], msg_type: str,
+                  uptime: float, message_count: int, connection_id: str,
+                  now_i: int) -> bytes:
+    # Handle audio data (for your main app)
+    audio_size = len(message.get('data', ''))
+    return (_AUDIO_RECEIVED_TMPL
+            .replace(b"__SIZE__", str(audio_size).encode())
+            .replace(b"__TS__", str(now_i).encode()))
+
+
+def _handle_echo(message: Dict[str, Any], msg_type: str,
+                 uptime: float, message_count: int, connection_id: str,
+                 now_i: int) -> bytes:
+    # Echo unknown messages: the payload shape is arbitrary, so this cold
+    # fallback goes through the full encoder instead of a template
+    return _dumps({
+        "type": "echo",
+        "original_type": msg_type,
+        "message": f"📡 Echo: {msg_type}",
+        "original_message": message,
+        "timestamp": now_i
+    })
+
+
+_HANDLERS: Dict[str, Handler] = {
+    "ping": _handle_ping,
+    "test": _handle_test,
+    "heartbeat": _handle_heartbeat,
+    "audio_stream": _handle_audio,
+}
+
+
+def handle_message(message: Dict[str, Any], msg_type: str,
+                   uptime: float, message_count: int, connection_id: str,
+                   now_i: int) -> bytes:
+    """Build the serialized response for one parsed message"""
+    handler = _HANDLERS.get(msg_type, _handle_echo)
+    return handler(message, msg_type, uptime, message_count,
+                   connection_id, now_i)